@@ -0,0 +1,101 @@
+from collections import OrderedDict
+
+MAX_CACHED_LAYOUTS = 64
+
+# Compiled checker tables, keyed by dot layout so puzzles with the same dots share them
+checker_cache = OrderedDict()
+
+# Compiled per-cell checkers, keyed by (row, col, surrounding dots); at most 81 * 3**4 entries
+cell_cache = {}
+
+def layout_key(horiz_adjacency, vert_adjacency):
+    return tuple(map(tuple, horiz_adjacency)), tuple(map(tuple, vert_adjacency))
+
+def dot_source(kind, orientation, side, nr, nc):
+    """
+    Source lines checking one dot between the cell being checked and its neighbor at (nr, nc).
+    """
+    color = "White" if kind == 1 else "Black"
+    if kind == 1:
+        violated = "abs(value - neighbor) != 1"
+    else:
+        violated = "value != 2 * neighbor and neighbor != 2 * value"
+    return [
+        f"    neighbor = board[{nr}][{nc}]",
+        f"    if neighbor != 0 and {violated}:",
+        f"        log_file.write(f\"Inconsistency: {color} {orientation} constraint between {{value}} and {side} neighbor {{neighbor}} at ({nr}, {nc}) not satisfied\\n\")",
+        "        return False",
+    ]
+
+def cell_source(row, col, horiz_adjacency, vert_adjacency):
+    """
+    Generates a checker for one cell with its row, column and box unrolled and only its own dots inlined.
+    Log messages match is_consistent in test3.
+    """
+    box_row, box_col = row // 3 * 3, col // 3 * 3
+    column = ", ".join(f"board[{r}][{col}]" for r in range(9))
+    box = ", ".join(f"board[{i}][{j}]" for i in range(box_row, box_row + 3) for j in range(box_col, box_col + 3))
+    lines = [
+        f"def check_{row}_{col}(board, value, log_file):",
+        f"    if value in board[{row}]:",
+        f"        log_file.write(f\"Inconsistency: Value {{value}} already exists in row {row}\\n\")",
+        "        return False",
+        f"    if value in ({column}):",
+        f"        log_file.write(f\"Inconsistency: Value {{value}} already exists in column {col}\\n\")",
+        "        return False",
+        f"    if value in ({box}):",
+        f"        log_file.write(f\"Inconsistency: Value {{value}} already exists in box starting at ({box_row}, {box_col})\\n\")",
+        "        return False",
+    ]
+
+    # Same order as is_consistent: left, right, above, below
+    if col > 0 and horiz_adjacency[row][col - 1] != 0:
+        lines += dot_source(horiz_adjacency[row][col - 1], "Horizontal", "left", row, col - 1)
+    if col < 8 and horiz_adjacency[row][col] != 0:
+        lines += dot_source(horiz_adjacency[row][col], "Horizontal", "right", row, col + 1)
+    if row > 0 and vert_adjacency[row - 1][col] != 0:
+        lines += dot_source(vert_adjacency[row - 1][col], "Vertical", "above", row - 1, col)
+    if row < 8 and vert_adjacency[row][col] != 0:
+        lines += dot_source(vert_adjacency[row][col], "Vertical", "below", row + 1, col)
+
+    lines.append("    return True")
+    return "\n".join(lines)
+
+def cell_dots(row, col, horiz_adjacency, vert_adjacency):
+    """
+    The dots around one cell (left, right, above, below), 0 where there is none or the board ends.
+    """
+    return (
+        horiz_adjacency[row][col - 1] if col > 0 else 0,
+        horiz_adjacency[row][col] if col < 8 else 0,
+        vert_adjacency[row - 1][col] if row > 0 else 0,
+        vert_adjacency[row][col] if row < 8 else 0,
+    )
+
+def compile_cell(row, col, horiz_adjacency, vert_adjacency):
+    """
+    Returns the checker for one cell, compiling it only the first time its surrounding dots are seen.
+    """
+    key = (row, col, cell_dots(row, col, horiz_adjacency, vert_adjacency))
+    if key not in cell_cache:
+        namespace = {}
+        exec(compile(cell_source(row, col, horiz_adjacency, vert_adjacency), "<compiled checker>", "exec"), namespace)
+        cell_cache[key] = namespace[f"check_{row}_{col}"]
+    return cell_cache[key]
+
+def compile_checker(horiz_adjacency, vert_adjacency):
+    """
+    Returns a 9x9 table of per-cell checkers, each called as checker(board, value, log_file).
+    Tables are cached per dot layout (least recently used first out, at most MAX_CACHED_LAYOUTS);
+    a layout that differs by one dot only compiles the two cells next to that dot.
+    """
+    key = layout_key(horiz_adjacency, vert_adjacency)
+    if key in checker_cache:
+        checker_cache.move_to_end(key)
+        return checker_cache[key]
+
+    checkers = [[compile_cell(r, c, horiz_adjacency, vert_adjacency) for c in range(9)] for r in range(9)]
+    checker_cache[key] = checkers
+    if len(checker_cache) > MAX_CACHED_LAYOUTS:
+        checker_cache.popitem(last=False)
+    return checkers
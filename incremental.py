@@ -0,0 +1,171 @@
+import sys
+
+import test3
+from compiled_checker import compile_checker
+from test3 import read_input_file, is_consistent, get_neighbors, backtrack_with_forward_checking, write_output_file
+
+def dot_satisfied(kind, a, b):
+    """
+    Checks a single Kropki dot between two filled values (0 = no dot, 1 = white, 2 = black).
+    """
+    if kind == 1:
+        return abs(a - b) == 1
+    if kind == 2:
+        return a == 2 * b or b == 2 * a
+    return True
+
+def prune_cell_domain(state, row, col, log_file):
+    """
+    Recomputes the domain of one cell against the current givens and dots.
+    A given keeps its own value only if it does not clash with the other givens.
+    """
+    givens = state["givens"]
+    given = givens[row][col]
+
+    # Clear the cell itself so it does not count against its own row, column and box
+    givens[row][col] = 0
+    candidates = [given] if given != 0 else range(1, 10)
+    state["domain"][(row, col)] = {v for v in candidates if is_consistent(givens, row, col, v, state["horiz_adjacency"], state["vert_adjacency"], log_file)}
+    givens[row][col] = given
+
+def repair_domains(state, cells, log_file):
+    """
+    Re-propagates the givens into the domains of the affected cells only.
+    """
+    for r, c in cells:
+        prune_cell_domain(state, r, c, log_file)
+    log_file.write(f"Repaired domains of {len(cells)} cells.\n")
+
+def start_session(board, horiz_adjacency, vert_adjacency, log_file):
+    """
+    Builds the state kept between edits: givens, dots, propagated domains and the last answer.
+    """
+    state = {
+        "givens": [row[:] for row in board],
+        "horiz_adjacency": [row[:] for row in horiz_adjacency],
+        "vert_adjacency": [row[:] for row in vert_adjacency],
+        "domain": {},
+        "solution": None,
+        "unsolvable": False,  # Last search proved there is no solution
+    }
+    repair_domains(state, [(r, c) for r in range(9) for c in range(9)], log_file)
+    return state
+
+def start_session_from_file(filename, log_file):
+    board, horiz_adjacency, vert_adjacency = read_input_file(filename)
+    return start_session(board, horiz_adjacency, vert_adjacency, log_file)
+
+def set_given(state, row, col, value, log_file):
+    """
+    Adds, changes or removes (value 0) the given at (row, col).
+    Only the cell, its row/column/box peers and its dot neighbors are repaired.
+    """
+    if not (0 <= row < 9 and 0 <= col < 9):
+        raise ValueError(f"Cell ({row}, {col}) is outside the 9x9 board.")
+    if value not in range(0, 10):
+        raise ValueError(f"Invalid value {value} found at position ({row}, {col}).")
+
+    old_value = state["givens"][row][col]
+    if old_value == value:
+        return
+    state["givens"][row][col] = value
+    log_file.write(f"Given at ({row}, {col}) changed from {old_value} to {value}.\n")
+
+    # Peers do not depend on the value, so the dot layout alone decides what to repair
+    affected = get_neighbors(row, col, state["horiz_adjacency"], state["vert_adjacency"])
+    affected.add((row, col))
+    repair_domains(state, affected, log_file)
+
+    # Removing or replacing a given relaxes the puzzle, so an earlier "no solution" may no longer hold
+    if old_value != 0:
+        state["unsolvable"] = False
+
+    # The old solution satisfied every other constraint; only the edited cell can break it
+    solution = state["solution"]
+    if solution and value != 0 and solution[row][col] != value:
+        log_file.write(f"Previous solution has {solution[row][col]} at ({row}, {col}); discarding it.\n")
+        state["solution"] = None
+
+def set_dot(state, adjacency, row, col, kind, first, second, log_file):
+    """
+    Sets one entry of an adjacency grid to kind; first and second are the two cells the dot sits between.
+    """
+    if kind not in {0, 1, 2}:
+        raise ValueError(f"Invalid value {kind} found at position ({row}, {col}).")
+
+    old_kind = adjacency[row][col]
+    if old_kind == kind:
+        return
+    adjacency[row][col] = kind
+    log_file.write(f"Dot between {first} and {second} changed from {old_kind} to {kind}.\n")
+
+    # A dot only constrains the two cells it sits between
+    repair_domains(state, [first, second], log_file)
+
+    if old_kind != 0:
+        state["unsolvable"] = False
+
+    solution = state["solution"]
+    if solution and not dot_satisfied(kind, solution[first[0]][first[1]], solution[second[0]][second[1]]):
+        log_file.write(f"Previous solution breaks the dot between {first} and {second}; discarding it.\n")
+        state["solution"] = None
+
+def set_horizontal_dot(state, row, col, kind, log_file):
+    """
+    Sets the dot between (row, col) and (row, col + 1); kind 0 removes it.
+    """
+    if not (0 <= row < 9 and 0 <= col < 8):
+        raise ValueError(f"Horizontal dot ({row}, {col}) is outside the 9x8 grid.")
+    set_dot(state, state["horiz_adjacency"], row, col, kind, (row, col), (row, col + 1), log_file)
+
+def set_vertical_dot(state, row, col, kind, log_file):
+    """
+    Sets the dot between (row, col) and (row + 1, col); kind 0 removes it.
+    """
+    if not (0 <= row < 8 and 0 <= col < 9):
+        raise ValueError(f"Vertical dot ({row}, {col}) is outside the 8x9 grid.")
+    set_dot(state, state["vert_adjacency"], row, col, kind, (row, col), (row + 1, col), log_file)
+
+def solve(state, log_file):
+    """
+    Returns a solution for the current givens and dots, or None if there is none.
+    Reuses the previous answer whenever the edits since then have not invalidated it.
+    The returned board is a copy, so callers may modify it without touching the cached answer.
+    """
+    if state["solution"]:
+        log_file.write("Previous solution still satisfies all constraints; reusing it.\n")
+        return [row[:] for row in state["solution"]]
+    if state["unsolvable"]:
+        log_file.write("Edits since the last search only added constraints; still no solution.\n")
+        return None
+
+    if any(not values for values in state["domain"].values()):
+        log_file.write("A cell has an empty domain after propagation; no solution.\n")
+        state["unsolvable"] = True
+        return None
+
+    # Dots may have changed since the last search; only cells next to a changed dot get recompiled
+    checkers = compile_checker(state["horiz_adjacency"], state["vert_adjacency"])
+
+    # The search prunes test3's global domain in place, so hand it a copy of the propagated one
+    test3.domain = {cell: values.copy() for cell, values in state["domain"].items()}
+    test3.domain_changes = {}
+    board = [row[:] for row in state["givens"]]
+    solution = backtrack_with_forward_checking(board, state["horiz_adjacency"], state["vert_adjacency"], log_file, checkers)
+
+    state["solution"] = solution
+    state["unsolvable"] = solution is None
+    return [row[:] for row in solution] if solution else None
+
+if __name__ == "__main__":
+    input_filename, output_filename = sys.argv[1], sys.argv[2]
+    log_filename = "Working.txt"
+
+    with open(log_filename, "w") as log_file:
+        state = start_session_from_file(input_filename, log_file)
+        solution = solve(state, log_file)
+        if solution:
+            write_output_file(solution, output_filename)
+            print("Solution found and written")
+        else:
+            print("No solution exists.")
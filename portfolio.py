@@ -0,0 +1,194 @@
+import json
+import multiprocessing
+import os
+import queue
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+
+import test3
+from compiled_checker import compile_checker
+from test3 import read_input_file, initialize_domain, is_consistent, select_unassigned_variable, forward_check, restore_domains, write_output_file
+
+# Each configuration varies the search strategy, value order and tie-breaking.
+# They are listed in the order they get a process when there are fewer CPUs than configurations.
+# Configurations with restarts cut the search after luby(i) * RESTART_UNIT failures and start over.
+CONFIGURATIONS = [
+    {"name": "fc-ascending", "strategy": "forward_check", "value_order": "ascending", "random_ties": False, "restarts": False, "seed": 0},
+    {"name": "fc-ascending-luby", "strategy": "forward_check", "value_order": "ascending", "random_ties": True, "restarts": True, "seed": 4},
+    {"name": "bt-ascending", "strategy": "backtrack", "value_order": "ascending", "random_ties": False, "restarts": False, "seed": 0},
+    {"name": "fc-random-luby", "strategy": "forward_check", "value_order": "random", "random_ties": True, "restarts": True, "seed": 1},
+    {"name": "fc-descending-luby", "strategy": "forward_check", "value_order": "descending", "random_ties": True, "restarts": True, "seed": 2},
+    {"name": "bt-random-luby", "strategy": "backtrack", "value_order": "random", "random_ties": True, "restarts": True, "seed": 3},
+]
+
+RESTART_UNIT = 100  # Failures allowed per unit of the Luby sequence
+
+POLL_INTERVAL = 0.1  # Seconds between checks for a result or for every worker having died
+
+class RestartLimitReached(Exception):
+    pass
+
+def luby(i):
+    """
+    Returns the i-th term (1-based) of the Luby sequence 1 1 2 1 1 2 4 1 1 2 ...
+    """
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    if i == (1 << k) - 1:
+        return 1 << (k - 1)
+    return luby(i - (1 << (k - 1)) + 1)
+
+def order_values(values, value_order, rng):
+    values = sorted(values)
+    if value_order == "descending":
+        values.reverse()
+    elif value_order == "random":
+        rng.shuffle(values)
+    return values
+
+def search(board, horiz_adjacency, vert_adjacency, config, rng, budget, log_file, checkers):
+    """
+    Backtracking search driven by one portfolio configuration.
+    Raises RestartLimitReached once the failure budget for the current run is spent.
+    """
+    cell = select_unassigned_variable(board, horiz_adjacency, vert_adjacency, log_file, rng if config["random_ties"] else None, checkers)
+    if not cell:
+        return board  # Solution found
+
+    row, col = cell
+    forward_checking = config["strategy"] == "forward_check"
+    candidates = test3.domain[(row, col)] if forward_checking else range(1, 10)
+
+    for value in order_values(candidates, config["value_order"], rng):
+        if is_consistent(board, row, col, value, horiz_adjacency, vert_adjacency, log_file, checkers):
+            board[row][col] = value
+            if not forward_checking or forward_check(board, row, col, horiz_adjacency, vert_adjacency, log_file, checkers):
+                result = search(board, horiz_adjacency, vert_adjacency, config, rng, budget, log_file, checkers)
+                if result:
+                    return result
+            board[row][col] = 0
+            if forward_checking:
+                restore_domains(row, col, log_file)
+
+    budget["failures"] += 1
+    if budget["limit"] and budget["failures"] >= budget["limit"]:
+        raise RestartLimitReached()
+    return None
+
+def run_configuration(config, board, horiz_adjacency, vert_adjacency, results):
+    """
+    Worker process: runs one configuration (with restarts if enabled) and reports to the results queue.
+    """
+    rng = random.Random(config["seed"])
+    checkers = compile_checker(horiz_adjacency, vert_adjacency)
+    start = time.time()
+    run = 0
+    with open(os.devnull, "w") as log_file:
+        while True:
+            run += 1
+            board_copy = [row[:] for row in board]
+            test3.domain = initialize_domain(board_copy)
+            test3.domain_changes = {}
+            budget = {"failures": 0, "limit": luby(run) * RESTART_UNIT if config["restarts"] else 0}
+            try:
+                solution = search(board_copy, horiz_adjacency, vert_adjacency, config, rng, budget, log_file, checkers)
+                break  # Either a solution or an exhaustive proof that none exists
+            except RestartLimitReached:
+                continue
+    results.put((config["name"], solution, time.time() - start, run))
+
+def puzzle_features(board, horiz_adjacency, vert_adjacency):
+    """
+    Coarse description of a puzzle used to group portfolio wins.
+    """
+    dots = Counter(v for grid in (horiz_adjacency, vert_adjacency) for row in grid for v in row)
+    return {
+        "givens": sum(1 for row in board for v in row if v != 0),
+        "white_dots": dots[1],
+        "black_dots": dots[2],
+    }
+
+def record_win(stats_filename, features, raced, winner, elapsed, runs):
+    """
+    Appends one race to the stats file, including every configuration that took part.
+    """
+    with open(stats_filename, "a") as file:
+        file.write(json.dumps({"features": features, "raced": raced, "winner": winner, "seconds": round(elapsed, 4), "runs": runs}) + "\n")
+
+def summarize_wins(stats_filename):
+    """
+    Counts wins out of races entered per configuration, grouped by the number of givens and dots
+    (in buckets of 10). Returns {kind: {name: (wins, races entered)}}, so configurations that
+    only get a process on larger machines are not counted as losing races they never ran.
+    """
+    wins = defaultdict(Counter)
+    entered = defaultdict(Counter)
+    with open(stats_filename, "r") as file:
+        for line in file:
+            entry = json.loads(line)
+            features = entry["features"]
+            kind = (features["givens"] // 10 * 10, (features["white_dots"] + features["black_dots"]) // 10 * 10)
+            wins[kind][entry["winner"]] += 1
+            for name in entry["raced"]:
+                entered[kind][name] += 1
+    return {kind: {name: (wins[kind][name], count) for name, count in entered[kind].items()} for kind in entered}
+
+def solve_portfolio(board, horiz_adjacency, vert_adjacency, configurations=CONFIGURATIONS, processes=None, timeout=None, stats_filename=None):
+    """
+    Races the configurations in separate processes; the first to finish wins and the rest are killed.
+    Only the first `processes` configurations (default: one per CPU) are raced, since extra
+    processes on a busy machine just slow every racer down.
+    Returns (solution, winner name), or (None, None) if nothing finished within the timeout
+    or every worker exited (e.g. crashed) without reporting.
+    """
+    processes = processes or os.cpu_count() or 1
+    raced = configurations[:processes]
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=run_configuration, args=(config, board, horiz_adjacency, vert_adjacency, results), daemon=True) for config in raced]
+    for worker in workers:
+        worker.start()
+
+    deadline = None if timeout is None else time.time() + timeout
+    winner, solution = None, None
+    try:
+        while True:
+            try:
+                winner, solution, elapsed, runs = results.get(timeout=POLL_INTERVAL)
+                break
+            except queue.Empty:
+                pass
+            if deadline is not None and time.time() >= deadline:
+                break
+            if not any(worker.is_alive() for worker in workers):
+                # A worker may have reported just before exiting, so drain once more
+                try:
+                    winner, solution, elapsed, runs = results.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    pass
+                break
+    finally:
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.join()
+
+    if winner and stats_filename:
+        record_win(stats_filename, puzzle_features(board, horiz_adjacency, vert_adjacency), [config["name"] for config in raced], winner, elapsed, runs)
+    return solution, winner
+
+if __name__ == "__main__":
+    input_filename, output_filename = sys.argv[1], sys.argv[2]
+    stats_filename = sys.argv[3] if len(sys.argv) > 3 else "portfolio_stats.jsonl"
+
+    board, horiz_adjacency, vert_adjacency = read_input_file(input_filename)
+    solution, winner = solve_portfolio(board, horiz_adjacency, vert_adjacency, stats_filename=stats_filename)
+    if solution:
+        write_output_file(solution, output_filename)
+        print(f"Solution found by {winner} and written")
+    elif winner:
+        print(f"No solution exists (proved by {winner}).")
+    else:
+        print("No configuration reported a result.")
@@ -1,5 +1,7 @@
 import sys
 
+from compiled_checker import compile_checker
+
 def initialize_domain(board):
     domain = {}
     for r in range(9):
@@ -46,7 +48,11 @@ def read_input_file(filename):
     return board, horiz_adjacency, vert_adjacency
 
 # Check if the value is consistent with Sudoku rules and Kropki constraints
-def is_consistent(board, row, col, value, horiz_adjacency, vert_adjacency, log_file):
+# checkers is an optional table from compile_checker built for these same adjacency grids
+def is_consistent(board, row, col, value, horiz_adjacency, vert_adjacency, log_file, checkers=None):
+    if checkers is not None:
+        return checkers[row][col](board, value, log_file)
+
     # Check row and column uniqueness
     if value in board[row]:
         log_file.write(f"Inconsistency: Value {value} already exists in row {row}\n")
@@ -137,16 +143,18 @@ def get_neighbors(row, col, horiz_adjacency, vert_adjacency):
 
     return neighbors
 
-def select_unassigned_variable(board, horiz_adjacency, vert_adjacency, log_file):
+# Passing a random.Random as rng breaks remaining MRV/DH ties at random instead of by scan order
+def select_unassigned_variable(board, horiz_adjacency, vert_adjacency, log_file, rng=None, checkers=None):
     best_cell = None
     min_remaining = 10  # Initialize with a value larger than the domain size
     max_degree = -1
+    ties = 0
 
     for r in range(9):
         for c in range(9):
             if board[r][c] == 0:  # Unassigned cell
                 # Calculate remaining legal values (MRV)
-                legal_values = [val for val in range(1, 10) if is_consistent(board, r, c, val, horiz_adjacency, vert_adjacency, log_file)]
+                legal_values = [val for val in range(1, 10) if is_consistent(board, r, c, val, horiz_adjacency, vert_adjacency, log_file, checkers)]
                 num_remaining = len(legal_values)
                 # num_remaining = len(domain[(r, c)])
 
@@ -159,6 +167,12 @@ def select_unassigned_variable(board, horiz_adjacency, vert_adjacency, log_file)
                     best_cell = (r, c)
                     min_remaining = num_remaining
                     max_degree = degree
+                    ties = 1
+                elif rng is not None and num_remaining == min_remaining and degree == max_degree:
+                    # Reservoir sampling keeps each tied cell with equal probability
+                    ties += 1
+                    if rng.randrange(ties) == 0:
+                        best_cell = (r, c)
 
     if best_cell:
         log_file.write(f"Selected cell {best_cell} with MRV {min_remaining} and DH {max_degree}\n")
@@ -173,7 +187,7 @@ def write_output_file(board, filename):
 # Dictionary to track domain changes for each variable
 domain_changes = {}
 
-def forward_check(board, row, col, horiz_adjacency, vert_adjacency, log_file):
+def forward_check(board, row, col, horiz_adjacency, vert_adjacency, log_file, checkers=None):
     """
     Updates the domains of neighboring cells after assigning a value to a cell.
     Returns True if forward checking succeeds, False otherwise.
@@ -212,7 +226,7 @@ def forward_check(board, row, col, horiz_adjacency, vert_adjacency, log_file):
             # Check if domain becomes empty
             domain_copy = domain[(r, c)].copy()
             for v in domain_copy:
-                if not is_consistent(board, r, c, v, horiz_adjacency, vert_adjacency, log_file):
+                if not is_consistent(board, r, c, v, horiz_adjacency, vert_adjacency, log_file, checkers):
                     domain_changes[(row, col)].add((r, c, v))
                     domain[(r, c)].remove(v)
 
@@ -238,12 +252,12 @@ def restore_domains(row, col, log_file):
     del domain_changes[(row, col)]
     log_file.write(f"Domains restored after backtracking on cell ({row}, {col}).\n")
 
-def backtrack_with_forward_checking(board, horiz_adjacency, vert_adjacency, log_file):
+def backtrack_with_forward_checking(board, horiz_adjacency, vert_adjacency, log_file, checkers=None):
     """
     Backtracking algorithm with forward checking.
     """
     # Select the next unassigned cell using MRV and DH
-    cell = select_unassigned_variable(board, horiz_adjacency, vert_adjacency, log_file)
+    cell = select_unassigned_variable(board, horiz_adjacency, vert_adjacency, log_file, checkers=checkers)
     if not cell:
         return board  # Solution found
 
@@ -253,9 +267,9 @@ def backtrack_with_forward_checking(board, horiz_adjacency, vert_adjacency, log_
     # Iterate over sorted legal values for the selected cell
     for value in sorted(domain[(row, col)]):
         log_file.write(f"Trying value {value} for cell ({row}, {col}).\n")
-        if is_consistent(board, row, col, value, horiz_adjacency, vert_adjacency, log_file):
+        if is_consistent(board, row, col, value, horiz_adjacency, vert_adjacency, log_file, checkers):
             # Assign the value and apply forward checking
-            if forward_check(board, row, col, horiz_adjacency, vert_adjacency, log_file):
+            if forward_check(board, row, col, horiz_adjacency, vert_adjacency, log_file, checkers):
                 board[row][col] = value
                 log_file.write(f"Assigned value {value} to cell ({row}, {col}).\n")
                 log_file.write("Current board state:\n")
@@ -264,7 +278,7 @@ def backtrack_with_forward_checking(board, horiz_adjacency, vert_adjacency, log_
                 log_file.write("\n")
 
                 # Recur to solve the rest of the board
-                result = backtrack_with_forward_checking(board, horiz_adjacency, vert_adjacency, log_file)
+                result = backtrack_with_forward_checking(board, horiz_adjacency, vert_adjacency, log_file, checkers)
                 if result:
                     return result  # Solution found
                 else:
@@ -287,13 +301,14 @@ if __name__ == "__main__":
     
     # Read input data
     board, horiz_adjacency, vert_adjacency = read_input_file(input_filename)
+    checkers = compile_checker(horiz_adjacency, vert_adjacency)
     board_copy = board
 
     domain = initialize_domain(board)
     # print(domain)
 
     with open(log_filename, "w") as log_file:    
-        solution = backtrack_with_forward_checking(board_copy, horiz_adjacency, vert_adjacency, log_file)
+        solution = backtrack_with_forward_checking(board_copy, horiz_adjacency, vert_adjacency, log_file, checkers)
         if solution:
             write_output_file(solution, output_filename)
             print("Solution found and written")
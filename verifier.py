@@ -0,0 +1,122 @@
+import sys
+
+import numpy as np
+
+from test3 import read_input_file, check_grid
+
+FULL_MASK = 0b1111111110  # Bits 1..9 set: every digit present exactly once in a group of 9 cells
+
+CHECKS = ["values", "rows", "columns", "boxes", "givens", "horizontal_dots", "vertical_dots"]
+
+def read_output_file(filename):
+    with open(filename, 'r') as file:
+        board = [list(map(int, file.readline().split())) for _ in range(9)]
+    check_grid(board, 9, 9, set(range(1, 10)))
+    return board
+
+def load_pairs(pairs):
+    """
+    Loads (input, output) file pairs into stacked arrays.
+    Files that are missing or malformed are loaded as empty grids and flagged in
+    `input_readable` / `output_readable`.
+    """
+    count = len(pairs)
+    givens = np.zeros((count, 9, 9), dtype=np.int8)
+    horiz = np.zeros((count, 9, 8), dtype=np.int8)
+    vert = np.zeros((count, 8, 9), dtype=np.int8)
+    solved = np.zeros((count, 9, 9), dtype=np.int8)
+    input_readable = np.ones(count, dtype=bool)
+    output_readable = np.ones(count, dtype=bool)
+
+    for i, (input_filename, output_filename) in enumerate(pairs):
+        try:
+            givens[i], horiz[i], vert[i] = read_input_file(input_filename)
+        except (OSError, ValueError):
+            input_readable[i] = False
+        try:
+            solved[i] = read_output_file(output_filename)
+        except (OSError, ValueError):
+            output_readable[i] = False
+
+    return givens, horiz, vert, solved, input_readable, output_readable
+
+def verify_boards(givens, horiz, vert, solved):
+    """
+    Checks N solved boards against their givens and dots in one batch.
+    Arrays are shaped (N, 9, 9), (N, 9, 8), (N, 8, 9) and (N, 9, 9).
+    Returns a dict mapping each name in CHECKS to an (N,) bool array, plus "ok" for all of them.
+    """
+    solved = np.asarray(solved, dtype=np.int16)
+    givens = np.asarray(givens)
+    horiz = np.asarray(horiz)
+    vert = np.asarray(vert)
+    count = solved.shape[0]
+
+    results = {}
+    results["values"] = ((solved >= 1) & (solved <= 9)).all(axis=(1, 2))
+
+    # One bit per digit; a group is complete when OR-ing its 9 cells sets bits 1..9.
+    # Out-of-range values are clipped to 0 so they cannot fake a digit.
+    bits = np.left_shift(1, np.where((solved >= 1) & (solved <= 9), solved, 0)).astype(np.uint16)
+    results["rows"] = (np.bitwise_or.reduce(bits, axis=2) == FULL_MASK).all(axis=1)
+    results["columns"] = (np.bitwise_or.reduce(bits, axis=1) == FULL_MASK).all(axis=1)
+    boxes = bits.reshape(count, 3, 3, 3, 3)  # (board, box row, row in box, box col, col in box)
+    results["boxes"] = (np.bitwise_or.reduce(boxes, axis=(2, 4)) == FULL_MASK).all(axis=(1, 2))
+
+    results["givens"] = ((givens == 0) | (givens == solved)).all(axis=(1, 2))
+
+    results["horizontal_dots"] = dots_hold(horiz, solved[:, :, :-1], solved[:, :, 1:])
+    results["vertical_dots"] = dots_hold(vert, solved[:, :-1, :], solved[:, 1:, :])
+
+    results["ok"] = np.logical_and.reduce([results[name] for name in CHECKS])
+    return results
+
+def dots_hold(adjacency, first, second):
+    """
+    Per-board check that every white (1) and black (2) dot holds between first and second.
+    """
+    white = np.abs(first - second) == 1
+    black = (first == 2 * second) | (second == 2 * first)
+    holds = (adjacency == 0) | ((adjacency == 1) & white) | ((adjacency == 2) & black)
+    return holds.all(axis=(1, 2))
+
+def failures(results, names):
+    """
+    Lists (name, failed checks) for every board that did not pass.
+    """
+    report = []
+    for i in np.flatnonzero(~results["ok"]):
+        report.append((names[i], [check for check in CHECKS if not results[check][i]]))
+    return report
+
+def verify_pairs(pairs, chunk_size=100000):
+    """
+    Verifies (input, output) file pairs chunk by chunk and returns the failure report.
+    """
+    report = []
+    for start in range(0, len(pairs), chunk_size):
+        chunk = pairs[start:start + chunk_size]
+        givens, horiz, vert, solved, input_readable, output_readable = load_pairs(chunk)
+        results = verify_boards(givens, horiz, vert, solved)
+        names = [output_filename for _, output_filename in chunk]
+        for i in np.flatnonzero(~input_readable | ~output_readable):
+            unreadable = []
+            if not input_readable[i]:
+                unreadable.append("input_unreadable")
+            if not output_readable[i]:
+                unreadable.append("output_unreadable")
+            report.append((names[i], unreadable))
+        # Already reported; the other checks mean nothing against an empty grid
+        results["ok"] |= ~input_readable | ~output_readable
+        report += failures(results, names)
+    return report
+
+if __name__ == "__main__":
+    # Usage: python verifier.py input1 output1 [input2 output2 ...]
+    args = sys.argv[1:]
+    pairs = list(zip(args[0::2], args[1::2]))
+
+    report = verify_pairs(pairs)
+    for name, failed in report:
+        print(f"{name}: failed {', '.join(failed)}")
+    print(f"{len(pairs) - len(report)} of {len(pairs)} solutions verified")